@@ -0,0 +1,388 @@
+"""
+Offline benchmark of the whoscored_light conversion paths.
+
+The benchmark runs on a recorded `matchCentreData` payload instead of the live site,
+so the numbers are reproducible. It measures throughput and peak memory of the "raw"
+(JSON decoding), "events", "spadl" and "atomic-spadl" conversions for a single match
+and for a synthetic season built by replaying the payload with different match IDs.
+
+By default a deterministic synthetic payload is generated in memory, so the benchmark
+runs out of the box and results of different machines are comparable.
+
+Usage:
+    # run the benchmark on the synthetic payload and save the results
+    python benchmark.py --output results.json
+
+    # record a real payload (needs a browser) and benchmark it; the match ID is taken
+    # from the file name unless --match-id is given
+    python benchmark.py --record 1916923
+    python benchmark.py --payload fixtures/1916923.json
+
+    # compare with earlier results
+    python benchmark.py --output new.json --compare results.json
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from whoscored_light import whoscored_convert_event, whoscored_read_event
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+SYNTHETIC_MATCH_ID = 1
+
+OUTPUT_FORMATS = ["raw", "events", "spadl", "atomic-spadl"]
+
+
+def record_payload(match_id: int, path: Path) -> None:
+    """
+    Retrieves the raw payload of a match from WhoScored.com and saves it as JSON.
+
+    Args:
+        match_id (int): The numeric ID of the match on WhoScored.com.
+        path (Path): File to write the payload to.
+    """
+    json_data = whoscored_read_event(match_id, output_fmt="raw")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(json_data, f)
+
+
+def synthetic_payload(n_events: int = 1500, seed: int = 0) -> dict[str, Any]:
+    """
+    Builds a synthetic `matchCentreData` payload with the structure of a real one.
+
+    Possessions alternate between the teams and consist mostly of passes, with
+    take-ons, tackles, clearances, fouls and shots in between. The default payload is
+    the one the benchmark runs on if no recorded payload is given.
+
+    Args:
+        n_events (int, optional): Number of events. Defaults to 1500, about the size of
+            a real match.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict[str, Any]: The synthetic payload.
+    """
+    rng = random.Random(seed)
+    teams = {1: ("Home", 0), 2: ("Away", 20)}
+    event_types = [
+        (1, "Pass", 0.7),
+        (3, "TakeOn", 0.06),
+        (7, "Tackle", 0.05),
+        (12, "Clearance", 0.05),
+        (49, "BallRecovery", 0.05),
+        (4, "Foul", 0.03),
+        (61, "BallTouch", 0.03),
+        (13, "MissedShots", 0.015),
+        (15, "SavedShot", 0.01),
+        (16, "Goal", 0.005),
+    ]
+    zones = ["Back", "Center", "Left", "Right"]
+
+    events = []
+    team_id = 1
+    for i in range(n_events):
+        if rng.random() < 0.15:
+            team_id = 3 - team_id
+        type_value, type_name, _ = rng.choices(event_types, weights=[t[2] for t in event_types])[0]
+        period = 1 if i < n_events // 2 else 2
+        seconds = (i if period == 1 else i - n_events // 2) * 5400 // n_events
+        minute = seconds // 60 + (45 if period == 2 else 0)
+        x = round(rng.uniform(0, 100), 1)
+        y = round(rng.uniform(0, 100), 1)
+        qualifiers = [
+            {"type": {"value": 56, "displayName": "Zone"}, "value": rng.choice(zones)},
+        ]
+        event = {
+            "id": 2800000000 + i,
+            "eventId": i + 1,
+            "minute": minute,
+            "second": seconds % 60,
+            "teamId": team_id,
+            "playerId": 1000 + teams[team_id][1] + rng.randrange(11),
+            "x": x,
+            "y": y,
+            "expandedMinute": minute,
+            "period": {"value": period, "displayName": "FirstHalf" if period == 1 else "SecondHalf"},
+            "type": {"value": type_value, "displayName": type_name},
+            "outcomeType": {"value": int(rng.random() < 0.8), "displayName": "Successful"},
+            "satisfiedEventsTypes": [rng.randrange(200) for _ in range(rng.randrange(6))],
+            "isTouch": True,
+        }
+        if type_value == 1:
+            end_x = round(min(100.0, max(0.0, x + rng.uniform(-20, 30))), 1)
+            end_y = round(min(100.0, max(0.0, y + rng.uniform(-25, 25))), 1)
+            event["endX"] = end_x
+            event["endY"] = end_y
+            qualifiers += [
+                {"type": {"value": 140, "displayName": "PassEndX"}, "value": str(end_x)},
+                {"type": {"value": 141, "displayName": "PassEndY"}, "value": str(end_y)},
+                {"type": {"value": 212, "displayName": "Length"}, "value": str(round(rng.uniform(2, 50), 1))},
+                {"type": {"value": 213, "displayName": "Angle"}, "value": str(round(rng.uniform(0, 6.28), 2))},
+            ]
+            if rng.random() < 0.1:
+                qualifiers.append({"type": {"value": 1, "displayName": "Longball"}})
+        if type_value in (13, 15, 16):
+            event["isShot"] = True
+            event["goalMouthY"] = round(rng.uniform(44, 56), 1)
+            event["goalMouthZ"] = round(rng.uniform(0, 40), 1)
+            qualifiers.append({"type": {"value": 72, "displayName": "LeftFoot"}})
+        if type_value == 16:
+            event["isGoal"] = True
+        event["qualifiers"] = qualifiers
+        events.append(event)
+
+    return {
+        "playerIdNameDictionary": {
+            str(1000 + offset + i): f"{name} Player {i}" for name, offset in teams.values() for i in range(11)
+        },
+        "home": {"teamId": 1, "name": teams[1][0]},
+        "away": {"teamId": 2, "name": teams[2][0]},
+        "startTime": "2025-07-09T20:00:00",
+        "elapsed": "FT",
+        "events": events,
+    }
+
+
+def synthetic_season(json_data: dict[str, Any], match_id: int, n_matches: int) -> list[tuple[int, bytes]]:
+    """
+    Builds a synthetic season by replaying one payload with different match IDs.
+
+    Event IDs are shifted per match, so that they stay unique across the season.
+
+    Args:
+        json_data (dict[str, Any]): The recorded `matchCentreData` payload.
+        match_id (int): The match ID of the recorded payload.
+        n_matches (int): Number of matches in the season.
+
+    Returns:
+        list[tuple[int, bytes]]: Match IDs and JSON-encoded payloads.
+    """
+    season = []
+    for i in range(n_matches):
+        payload = copy.deepcopy(json_data)
+        offset = i * 10 ** 6
+        for event in payload["events"]:
+            if "id" in event:
+                event["id"] = int(event["id"]) + offset
+        season.append((match_id + i, json.dumps(payload).encode("utf-8")))
+    return season
+
+
+def _convert(matches: list[tuple[int, bytes]], output_fmt: str) -> tuple[int, int]:
+    """
+    Decodes and converts the payloads of several matches.
+
+    Args:
+        matches (list[tuple[int, bytes]]): Match IDs and JSON-encoded payloads.
+        output_fmt (str): One of "raw", "events", "spadl" or "atomic-spadl".
+
+    Returns:
+        tuple[int, int]: Number of input events and number of output rows.
+    """
+    n_events = 0
+    frames = []
+    for match_id, payload in matches:
+        json_data = json.loads(payload)
+        n_events += len(json_data["events"])
+        if output_fmt != "raw":
+            frames.append(whoscored_convert_event(json_data, match_id, output_fmt=output_fmt))
+
+    if output_fmt == "raw":
+        return n_events, n_events
+    return n_events, len(pd.concat(frames, ignore_index=True))
+
+
+def _measure(func: Callable[[], tuple[int, int]], repeat: int) -> dict[str, Any]:
+    """
+    Measures the running time and peak memory of a conversion.
+
+    The time is the median of `repeat` runs. Peak memory is measured in a separate
+    run with `tracemalloc`, which slows the code down.
+
+    Args:
+        func (Callable[[], tuple[int, int]]): The conversion to measure.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        dict[str, Any]: Events, rows, seconds and peak memory in MB.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_events, n_rows = func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        "events": n_events,
+        "rows": n_rows,
+        "seconds": seconds,
+        "events_per_s": n_events / seconds,
+        "peak_mb": peak / 2 ** 20,
+    }
+
+
+def run_benchmark(
+        json_data: dict[str, Any],
+        match_id: int,
+        season_matches: int = 380,
+        repeat: int = 5,
+        output_fmts: Optional[list[str]] = None
+) -> dict[str, Any]:
+    """
+    Runs the benchmark for a single match and a synthetic season.
+
+    Args:
+        json_data (dict[str, Any]): The recorded `matchCentreData` payload.
+        match_id (int): The match ID of the recorded payload.
+        season_matches (int, optional): Number of matches in the synthetic season.
+            Defaults to 380.
+        repeat (int, optional): Number of timed runs for a single match. The season is
+            timed once. Defaults to 5.
+        output_fmts (list[str], optional): Formats to benchmark. Defaults to all.
+
+    Returns:
+        dict[str, Any]: Environment information and one result per scenario and format.
+            The meta information contains a hash of the payload, so that only results
+            of the same payload are compared.
+    """
+    season = synthetic_season(json_data, match_id, season_matches)
+    scenarios = {
+        "match": (season[:1], repeat),
+        "season": (season, 1),
+    }
+
+    # Warm up lazy imports, so that they are not counted in the first measurement.
+    for output_fmt in output_fmts or OUTPUT_FORMATS:
+        _convert(season[:1], output_fmt)
+
+    results = []
+    for scenario, (matches, n_repeat) in scenarios.items():
+        for output_fmt in output_fmts or OUTPUT_FORMATS:
+            result = _measure(lambda: _convert(matches, output_fmt), n_repeat)
+            result = {
+                "scenario": scenario,
+                "output_fmt": output_fmt,
+                "matches": len(matches),
+                **result,
+                "matches_per_s": len(matches) / result["seconds"],
+            }
+            print(
+                f"{scenario:>6} {output_fmt:>12}: {result['seconds']:.3f} s, "
+                f"{result['events_per_s']:,.0f} events/s, peak {result['peak_mb']:.1f} MB"
+            )
+            results.append(result)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "match_id": match_id,
+            "events": len(json_data["events"]),
+            "payload_sha256": hashlib.sha256(json.dumps(json_data, sort_keys=True).encode("utf-8")).hexdigest(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(new: dict[str, Any], old: dict[str, Any], threshold: float = 0.1) -> list[str]:
+    """
+    Compares two benchmark results and lists regressions.
+
+    Args:
+        new (dict[str, Any]): The current results.
+        old (dict[str, Any]): The earlier results.
+        threshold (float, optional): Relative slowdown or memory growth reported as a
+            regression. Defaults to 0.1.
+
+    Returns:
+        list[str]: Descriptions of the regressions.
+    """
+    regressions = []
+    old_hash = old["meta"].get("payload_sha256")
+    if old_hash is not None and old_hash != new["meta"].get("payload_sha256"):
+        regressions.append("results were measured on different payloads")
+    old_results = {(r["scenario"], r["output_fmt"]): r for r in old["results"]}
+    for result in new["results"]:
+        key = (result["scenario"], result["output_fmt"])
+        if key not in old_results:
+            continue
+        for metric in ["seconds", "peak_mb"]:
+            ratio = result[metric] / old_results[key][metric]
+            if ratio > 1 + threshold:
+                regressions.append(f"{key[0]} {key[1]} {metric}: x{ratio:.2f}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--match-id", type=int, default=None,
+                        help="Match ID of the payload. Defaults to the name of the payload file")
+    parser.add_argument("--payload", type=Path, default=None,
+                        help="Payload to benchmark. Defaults to a synthetic payload")
+    parser.add_argument("--record", type=int, default=None, metavar="MATCH_ID",
+                        help="Record the payload of a match from WhoScored.com and exit")
+    parser.add_argument("--season-matches", type=int, default=380)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--formats", nargs="+", choices=OUTPUT_FORMATS, default=OUTPUT_FORMATS)
+    parser.add_argument("--output", type=Path, default=None, help="Save the results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.record is not None:
+        path = args.payload or FIXTURES_DIR / f"{args.record}.json"
+        record_payload(args.record, path)
+        print(f"Saved payload of match {args.record} to {path}")
+        raise SystemExit(0)
+
+    if args.payload is None:
+        payload = synthetic_payload()
+        match_id = args.match_id or SYNTHETIC_MATCH_ID
+    else:
+        if not args.payload.exists():
+            raise SystemExit(
+                f"Payload {args.payload} not found. Record it with `python benchmark.py --record <match_id>`."
+            )
+        with open(args.payload, encoding="utf-8") as f:
+            payload = json.load(f)
+        match_id = args.match_id
+        if match_id is None:
+            if not args.payload.stem.isdigit():
+                raise SystemExit(f"Cannot take the match ID from {args.payload.name}, pass --match-id.")
+            match_id = int(args.payload.stem)
+
+    results = run_benchmark(payload, match_id, args.season_matches, args.repeat, args.formats)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            raise SystemExit(1)
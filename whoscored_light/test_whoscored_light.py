@@ -0,0 +1,381 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import whoscored_light
+from benchmark import synthetic_payload
+from whoscored_light import (
+    whoscored_concat,
+    whoscored_convert_batch,
+    whoscored_convert_event,
+    whoscored_live_event,
+    whoscored_read_dataset,
+    whoscored_read_event_async,
+    whoscored_write_dataset,
+)
+
+
+def _pass_event(i: int) -> dict:
+    """A successful pass of the home team every 2 seconds, ending 10-20 units from where the next one starts."""
+    x = 40.0 + (i % 2) * 15.0
+    return {
+        "id": 2800000000 + i,
+        "eventId": i + 1,
+        "minute": (2 * i) // 60,
+        "second": (2 * i) % 60,
+        "expandedMinute": (2 * i) // 60,
+        "teamId": 10,
+        "playerId": 100 + i % 11,
+        "x": x,
+        "y": 50.0,
+        "endX": x + 5.0,
+        "endY": 50.0,
+        "period": {"value": 1, "displayName": "FirstHalf"},
+        "type": {"value": 1, "displayName": "Pass"},
+        "outcomeType": {"value": 1, "displayName": "Successful"},
+        "qualifiers": [],
+        "isTouch": True,
+    }
+
+
+def _payload(n_events: int) -> dict:
+    return {
+        "playerIdNameDictionary": {str(100 + i): f"Player {i}" for i in range(11)},
+        "home": {"teamId": 10, "name": "Home"},
+        "away": {"teamId": 20, "name": "Away"},
+        "startTime": "2025-07-09T20:00:00",
+        "events": [_pass_event(i) for i in range(n_events)],
+    }
+
+
+class FakeDriver(object):
+    """Replays a sequence of `matchCentreData` snapshots, one per page load."""
+
+    def __init__(self, snapshots: list):
+        self.snapshots = snapshots
+        self.poll = 0
+
+    def get(self, url: str) -> None:
+        pass
+
+    def refresh(self) -> None:
+        self.poll += 1
+
+    def execute_script(self, script: str) -> dict:
+        return json.loads(json.dumps(self.snapshots[min(self.poll, len(self.snapshots) - 1)]))
+
+
+def _upsert(polls: list) -> pd.DataFrame:
+    """Applies live actions like a consumer: replaces stored actions by `source_event_id`."""
+    df = polls[0]
+    for new_actions in polls[1:]:
+        df = pd.concat([df[~df["source_event_id"].isin(new_actions["source_event_id"])], new_actions])
+    return df.sort_values("action_id").reset_index(drop=True)
+
+
+def test_live_event_resends_actions_around_a_corrected_event():
+    pytest.importorskip("socceraction")
+    first = _payload(150)
+    second = _payload(160)
+    # Correct an older event and append new ones in the same poll.
+    second["events"][20]["y"] = 51.0
+    second["elapsed"] = "FT"
+
+    polls = list(whoscored_live_event(1, output_fmt="spadl", interval=0, driver=FakeDriver([first, second])))
+
+    assert len(polls) == 2
+    # The last two passes of the first poll are held back. The corrected pass is sent
+    # again with the dribble after it, and so is the pass before it with the dribble
+    # into the corrected one.
+    assert polls[1]["source_event_id"].unique().tolist() == \
+        [2800000019, 2800000020] + list(range(2800000148, 2800000160))
+    live = _upsert(polls)
+    assert live["action_id"].tolist() == list(range(len(live)))
+    pd.testing.assert_frame_equal(
+        live.drop(columns="source_event_id"),
+        whoscored_convert_event(second, 1, output_fmt="spadl"),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("output_fmt", ["spadl", "atomic-spadl"])
+def test_live_event_matches_full_conversion(output_fmt):
+    pytest.importorskip("socceraction")
+    json_data = synthetic_payload()
+    n_events = len(json_data["events"])
+    snapshots = [
+        {**json_data, "elapsed": None, "events": json_data["events"][:n_events * k // 15]} for k in range(1, 15)
+    ] + [json_data]
+
+    polls = list(whoscored_live_event(1, output_fmt=output_fmt, interval=0, driver=FakeDriver(snapshots)))
+
+    assert len(polls) == 15
+    pd.testing.assert_frame_equal(
+        pd.concat(polls, ignore_index=True).drop(columns="source_event_id"),
+        whoscored_convert_event(json_data, 1, output_fmt=output_fmt),
+        check_dtype=False,
+    )
+
+
+def test_qualifier_table_joins_events_on_id():
+    json_data = synthetic_payload(n_events=300)
+    events, qualifiers = whoscored_convert_event(json_data, 1, qualifiers_fmt="long")
+
+    joined = qualifiers.merge(events, on=["game_id", "id"])
+
+    assert len(qualifiers) > 0
+    assert len(joined) == len(qualifiers)
+
+
+def test_concat_reports_memory_of_compact_frames(capsys):
+    json_data = synthetic_payload(n_events=300)
+    frames = [whoscored_convert_event(json_data, match_id, compact=True) for match_id in [1, 2]]
+    records = []
+
+    df = whoscored_concat(frames, metrics=records.append)
+
+    assert capsys.readouterr().out == ""
+    assert records == [
+        {
+            "matches": 2,
+            "rows": 600,
+            "memory_bytes": int(df.memory_usage(deep=True).sum()),
+            "default_memory_bytes": records[0]["default_memory_bytes"],
+        }
+    ]
+    assert records[0]["memory_bytes"] < records[0]["default_memory_bytes"]
+    assert df["is_shot"].dtype == "boolean"
+    assert df["is_shot"].sum() == frames[0]["is_shot"].sum() * 2
+    assert df["minute"].dtype.itemsize >= 2
+
+
+def test_events_conversion_does_not_import_soccerdata():
+    code = (
+        "import sys\n"
+        "from benchmark import synthetic_payload\n"
+        "from whoscored_light import whoscored_convert_event\n"
+        "whoscored_convert_event(synthetic_payload(n_events=100), 1)\n"
+        "assert not [m for m in sys.modules if m.split('.')[0] in ('soccerdata', 'seleniumbase')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent)
+
+
+def _events_with_nulls() -> tuple:
+    """Events of two matches whose optional fields are missing in different places."""
+    first = synthetic_payload(n_events=200, seed=1)
+    first["events"][0]["cardType"] = {"value": 31, "displayName": "Yellow"}
+    first["events"][1]["relatedPlayerId"] = 1003
+    second = synthetic_payload(n_events=150, seed=2)
+    for attr in second["events"]:
+        attr["qualifiers"] = []
+        for key in ["isShot", "isGoal", "goalMouthY", "goalMouthZ", "endX", "endY"]:
+            attr.pop(key, None)
+    return whoscored_convert_event(first, 1), whoscored_convert_event(second, 2, compact=True)
+
+
+def test_dataset_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    first, second = _events_with_nulls()
+
+    files = whoscored_write_dataset(first, tmp_path, "ENG-Premier League", "2024/2025")
+    whoscored_write_dataset(second, tmp_path, "ENG-Premier League", "2024/2025")
+    # Writing a match again replaces its file.
+    assert whoscored_write_dataset(first, tmp_path, "ENG-Premier League", "2024/2025") == files
+    assert len(list(tmp_path.rglob("*.parquet"))) == 2
+
+    df = whoscored_read_dataset(tmp_path)
+    expected = pd.concat([first.astype(object), second.astype(object)], ignore_index=True)
+    pd.testing.assert_frame_equal(df.astype(object), expected.astype(object), check_dtype=False)
+
+    columns = ["game_id", "team_id", "team", "type", "x", "qualifiers"]
+    df = whoscored_read_dataset(tmp_path, match_ids=[1], teams=[2], columns=columns)
+    pd.testing.assert_frame_equal(
+        df.astype(object),
+        first.loc[first["team_id"] == 2, columns].reset_index(drop=True).astype(object),
+        check_dtype=False,
+    )
+    df = whoscored_read_dataset(tmp_path, season="2024/2025", teams=["Home"], columns=columns, compact=True)
+    assert df["game_id"].unique().tolist() == [1, 2]
+    assert df["team"].unique().tolist() == ["Home"]
+    assert len(df) == (first["team"] == "Home").sum() + (second["team"] == "Home").sum()
+
+
+def test_dataset_round_trip_of_qualifier_tables(tmp_path):
+    pytest.importorskip("pyarrow")
+    _, first = whoscored_convert_event(synthetic_payload(n_events=200, seed=1), 1, qualifiers_fmt="long")
+    _, second = whoscored_convert_event(synthetic_payload(n_events=150, seed=2), 2, qualifiers_fmt="long")
+    for df in [first, second, first]:
+        whoscored_write_dataset(df, tmp_path, "ENG-Premier League", "2425", output_fmt="qualifiers")
+
+    df = whoscored_read_dataset(tmp_path, output_fmt="qualifiers", match_ids=[2], columns=["id", "qualifier_id", "value"])
+    pd.testing.assert_frame_equal(
+        df.astype(object), second[["id", "qualifier_id", "value"]].astype(object), check_dtype=False
+    )
+    assert len(whoscored_read_dataset(tmp_path, output_fmt="qualifiers")) == len(first) + len(second)
+    with pytest.raises(ValueError):
+        whoscored_read_dataset(tmp_path, output_fmt="qualifiers", teams=[1])
+
+
+class BrowserPool(object):
+    """Starts fake drivers whose page loads take a delay per match, and counts the running ones."""
+
+    def __init__(self, delays: dict, interruptible: bool = True):
+        self.delays = delays
+        self.interruptible = interruptible
+        self.lock = threading.Lock()
+        self.started = 0
+        self.running = 0
+        self.max_running = 0
+
+    def start(self, path_to_browser: str, headless: bool) -> "PoolDriver":
+        with self.lock:
+            self.started += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        return PoolDriver(self)
+
+    def wait_until_idle(self, timeout: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout
+        while self.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+class PoolDriver(object):
+    """A driver of `BrowserPool`. Quitting it makes a running page load fail, like Selenium."""
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+        self.quit_event = threading.Event()
+
+    def get(self, url: str) -> None:
+        delay = self.pool.delays.get(int(url.split("/")[-2]), 0.05)
+        if not self.pool.interruptible:
+            time.sleep(delay)
+        elif self.quit_event.wait(delay):
+            raise RuntimeError("The driver was quit")
+
+    def refresh(self) -> None:
+        pass
+
+    def execute_script(self, script: str) -> dict:
+        return _payload(3)
+
+    def quit(self) -> None:
+        with self.pool.lock:
+            if not self.quit_event.is_set():
+                self.pool.running -= 1
+            self.quit_event.set()
+
+
+async def _read_all(match_ids: list, **kwargs) -> dict:
+    return {match_id: result async for match_id, result in whoscored_read_event_async(match_ids, "raw", **kwargs)}
+
+
+def test_read_event_async_times_out_and_limits_concurrency(monkeypatch):
+    pool = BrowserPool({3: 5.0})
+    monkeypatch.setattr(whoscored_light, "_start_driver", pool.start)
+    records = []
+
+    results = asyncio.run(
+        _read_all(
+            [1, 2, 3, 4, 5, 6],
+            max_concurrency=2,
+            min_interval=0,
+            timeout=0.5,
+            return_exceptions=True,
+            metrics=records.append,
+        )
+    )
+
+    assert isinstance(results.pop(3), asyncio.TimeoutError)
+    assert all(isinstance(result, dict) for result in results.values())
+    assert [record["match_id"] for record in records if record["error"] is not None] == [3]
+    assert pool.started == 6
+    assert pool.max_running == 2
+    assert pool.running == 0
+
+
+def test_read_event_async_timeout_excludes_waiting_for_a_worker(monkeypatch):
+    # The page load of match 1 cannot be interrupted and keeps its worker after the
+    # timeout. Match 2 gets the full timeout once the worker is free.
+    pool = BrowserPool({1: 1.0}, interruptible=False)
+    monkeypatch.setattr(whoscored_light, "_start_driver", pool.start)
+
+    results = asyncio.run(
+        _read_all([1, 2], max_concurrency=1, min_interval=0, timeout=0.5, return_exceptions=True)
+    )
+
+    assert isinstance(results[1], asyncio.TimeoutError)
+    assert isinstance(results[2], dict)
+    assert pool.max_running == 1
+
+
+def test_read_event_async_quits_drivers_on_early_close(monkeypatch):
+    pool = BrowserPool({match_id: 5.0 for match_id in range(2, 7)})
+    monkeypatch.setattr(whoscored_light, "_start_driver", pool.start)
+
+    async def read_first() -> int:
+        matches = whoscored_read_event_async(range(1, 7), "raw", max_concurrency=2, min_interval=0)
+        async for match_id, _ in matches:
+            await matches.aclose()
+            return match_id
+
+    assert asyncio.run(read_first()) == 1
+    pool.wait_until_idle()
+    assert pool.running == 0
+    assert pool.started < 6
+
+
+def _season(n_matches: int) -> dict:
+    """Synthetic payloads with different players per match and one player without a name."""
+    season = {}
+    for match_id in range(1, n_matches + 1):
+        json_data = synthetic_payload(n_events=200, seed=match_id)
+        offset = 100 * match_id
+        for attr in json_data["events"]:
+            attr["playerId"] += offset
+        json_data["playerIdNameDictionary"] = {
+            str(int(player_id) + offset): f"{name} ({match_id})"
+            for player_id, name in json_data["playerIdNameDictionary"].items()
+        }
+        json_data["events"][0]["playerId"] = 99999
+        season[match_id] = json_data
+    return season
+
+
+@pytest.mark.parametrize("output_fmt", ["events", "spadl"])
+def test_convert_batch_matches_per_match_conversion(tmp_path, output_fmt):
+    if output_fmt == "spadl":
+        pytest.importorskip("socceraction")
+    season = _season(4)
+    paths = []
+    for match_id, json_data in season.items():
+        paths.append(tmp_path / f"{match_id}.json")
+        paths[-1].write_text(json.dumps(json_data))
+
+    df, qualifiers = whoscored_convert_batch(paths, output_fmt=output_fmt, qualifiers_fmt="long", n_jobs=2)
+
+    per_match = [
+        whoscored_convert_event(json_data, match_id, output_fmt=output_fmt, qualifiers_fmt="long")
+        for match_id, json_data in season.items()
+    ]
+    expected = pd.concat([result[0] for result in per_match], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(qualifiers, whoscored_concat([result[1] for result in per_match]))
+    assert df.loc[df["player_id"] == 99999, "player"].eq(99999).all()
+
+    pd.testing.assert_frame_equal(
+        whoscored_convert_batch(season, output_fmt=output_fmt, n_jobs=2),
+        pd.concat(
+            [whoscored_convert_event(json_data, match_id, output_fmt=output_fmt) for match_id, json_data in season.items()],
+            ignore_index=True,
+        ),
+        check_dtype=False,
+    )
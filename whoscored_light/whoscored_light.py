@@ -1,19 +1,402 @@
+import asyncio
+import functools
 import json
 import io
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Mapping, Optional, Union
 
-import seleniumbase as sb
+import numpy as np
 import pandas as pd
-from soccerdata._common import standardize_colnames
+from pandas.api.types import union_categoricals
+
+FINISHED_ELAPSED = ["FT", "AET", "PEN"]
+
+# Opta type of ball recoveries, which are converted to SPADL with the next action.
+BALL_RECOVERY_TYPE = 49
+
+DATASET_FORMATS = ["events", "spadl", "atomic-spadl", "qualifiers"]
+
+BOOL_COLS = ["is_touch", "is_shot", "is_goal"]
+
+NESTED_COLS = ["qualifiers", "satisfied_events_types"]
+
+# Same as `soccerdata.whoscored.COLS_EVENTS`, kept here so that the "events"
+# conversion does not import soccerdata.
+COLS_EVENTS = {
+    # The ID of the game
+    "game_id": np.nan,
+    # 'PreMatch', 'FirstHalf', 'SecondHalf', 'PostGame'
+    "period": np.nan,
+    # Integer indicating the minute of the event, ignoring stoppage time
+    "minute": -1,
+    # Integer indicating the second of the event, ignoring stoppage time
+    "second": -1,
+    # Integer indicating the minute of the event, taking into account stoppage time
+    "expanded_minute": -1,
+    # String describing the event type (e.g. 'Goal', 'Yellow Card', etc.)
+    "type": np.nan,
+    # String describing the event outcome ('Succesful' or 'Unsuccessful')
+    "outcome_type": np.nan,
+    # The ID of the team that the event is associated with
+    "team_id": np.nan,
+    # The name of the team that the event is associated with
+    "team": np.nan,
+    # The ID of the player that the event is associated with
+    "player_id": np.nan,
+    # The name of the player that the event is associated with
+    "player": np.nan,
+    # Coordinates of the event's location
+    "x": np.nan,
+    "y": np.nan,
+    "end_x": np.nan,
+    "end_y": np.nan,
+    # Coordinates of a shot's location
+    "goal_mouth_y": np.nan,
+    "goal_mouth_z": np.nan,
+    # The coordinates where the ball was blocked
+    "blocked_x": np.nan,
+    "blocked_y": np.nan,
+    # List of dicts with event qualifiers
+    "qualifiers": [],
+    # Some boolean flags
+    "is_touch": False,
+    "is_shot": False,
+    "is_goal": False,
+    # 'Yellow', 'Red', 'SecondYellow'
+    "card_type": np.nan,
+    # The ID of the current event
+    "event_id": None,
+    # The ID of an associated event
+    "related_event_id": None,
+    # The ID of a secondary player that the event is associated with
+    "related_player_id": np.nan,
+}
+
+CATEGORY_COLS = [
+    "period",
+    "type",
+    "outcome_type",
+    "card_type",
+    "team",
+    "player",
+    "type_name",
+    "result_name",
+    "bodypart_name",
+]
+
+
+def _start_driver(path_to_browser: str, headless: bool) -> Any:
+    """
+    Starts an undetected Chrome driver with seleniumbase.
+
+    Args:
+        path_to_browser (str): Path to the Chrome binary to use with Selenium.
+        headless (bool): Whether to run the browser in headless mode.
+
+    Returns:
+        Any: The seleniumbase driver.
+
+    Raises:
+        ImportError: If the `seleniumbase` package is not installed.
+    """
+    try:
+        import seleniumbase as sb
+    except ImportError:
+        raise ImportError(
+            "The seleniumbase package is required to retrieve data from WhoScored.com. "
+            "Please install it with `pip install seleniumbase`."
+        )
+
+    return sb.Driver(
+        uc=True,
+        headless=headless,
+        binary_location=path_to_browser,
+    )
+
+
+def _new_record(match_id: int, output_fmt: str) -> dict[str, Any]:
+    """
+    Creates an empty metrics record of a retrieval or conversion.
+
+    Args:
+        match_id (int): The numeric ID of the match on WhoScored.com.
+        output_fmt (str): The requested output format.
+
+    Returns:
+        dict[str, Any]: A record with the keys `match_id`, `output_fmt`, `timings`
+            (seconds per phase), `payload_bytes`, `events`, `rows`, `retries` and `error`.
+    """
+    return {
+        "match_id": match_id,
+        "output_fmt": output_fmt,
+        "timings": {},
+        "payload_bytes": None,
+        "events": None,
+        "rows": None,
+        "retries": 0,
+        "error": None,
+    }
+
+
+@contextmanager
+def _timed(record: dict[str, Any], phase: str) -> Iterator[None]:
+    """
+    Adds the running time of a code block to a phase of a metrics record.
+
+    Args:
+        record (dict[str, Any]): The metrics record.
+        phase (str): Name of the phase, e.g. "page_load".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["timings"][phase] = record["timings"].get(phase, 0.0) + time.perf_counter() - start
+
+
+def _standardize_colnames(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts DataFrame column names to snake case.
+
+    Same as `soccerdata._common.standardize_colnames`, kept here so that the
+    conversion does not import soccerdata.
+
+    Args:
+        df (pd.DataFrame): A DataFrame with camelCase column names.
+
+    Returns:
+        pd.DataFrame: The DataFrame with snake_case column names.
+    """
+
+    def to_snake(name: str) -> str:
+        name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
+        name = re.sub("__([A-Z])", r"_\1", name)
+        name = re.sub("([a-z0-9])([A-Z])", r"\1_\2", name)
+        return name.lower().replace("-", "_").replace(" ", "")
+
+    return df.rename(columns={c: to_snake(c) for c in df.columns})
+
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcasts the columns of a WhoScored DataFrame to memory-compact dtypes.
+
+    ID columns are cast to the smallest integer type that holds all values (nullable
+    if the column has missing values), other integer columns (minutes, seconds) to at
+    least int16, so that arithmetic like `expanded_minute * 60` does not overflow,
+    coordinates to float32, flags (`is_shot`, `is_goal`) to nullable booleans and
+    low-cardinality string columns to categoricals.
+
+    Args:
+        df (pd.DataFrame): A DataFrame in "events", "spadl" or "atomic-spadl" format.
+
+    Returns:
+        pd.DataFrame: The DataFrame with downcast columns.
+    """
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        is_id = col == "id" or col.endswith("_id")
+        if col in CATEGORY_COLS:
+            df[col] = s.astype(object).astype("category")
+            continue
+        if col in BOOL_COLS:
+            df[col] = s.astype(object).astype("boolean")
+            continue
+        if is_id and s.dtype == object:
+            try:
+                s = pd.to_numeric(s)
+            except (ValueError, TypeError):
+                continue
+        if pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+            continue
+        elif pd.api.types.is_integer_dtype(s):
+            s = pd.to_numeric(s, downcast="integer")
+            if not is_id and s.dtype.itemsize < 2:
+                s = s.astype("int16")
+            df[col] = s
+        elif is_id:
+            if s.dropna().mod(1).eq(0).all():
+                df[col] = pd.to_numeric(s.astype("Int64"), downcast="integer")
+        else:
+            df[col] = s.astype("float32")
+    return df
+
+
+def _expanded_memory_usage(df: pd.DataFrame) -> int:
+    """
+    Returns the memory usage of a DataFrame in default (non-compact) dtypes.
+
+    Args:
+        df (pd.DataFrame): A DataFrame, possibly with compact dtypes.
+
+    Returns:
+        int: Memory usage in bytes with categoricals as objects and numeric columns
+            as 64-bit types.
+    """
+    dtypes = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            dtypes[col] = object
+        elif pd.api.types.is_bool_dtype(s):
+            continue
+        elif pd.api.types.is_extension_array_dtype(s) and pd.api.types.is_integer_dtype(s):
+            dtypes[col] = "float64"
+        elif pd.api.types.is_integer_dtype(s):
+            dtypes[col] = "int64"
+        elif pd.api.types.is_float_dtype(s):
+            dtypes[col] = "float64"
+    return int(df.astype(dtypes).memory_usage(deep=True).sum())
+
+
+def whoscored_concat(
+        frames: list[pd.DataFrame],
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> pd.DataFrame:
+    """
+    Concatenates WhoScored DataFrames of several matches.
+
+    Categorical columns (e.g. from `whoscored_read_event(..., compact=True)`) are
+    combined with a shared set of categories, so the result keeps categorical dtypes
+    instead of falling back to Python objects.
+
+    Args:
+        frames (list[pd.DataFrame]): DataFrames of the same format, one per match.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once with the memory
+            usage of the result, a dict with the keys `matches`, `rows`, `memory_bytes`
+            and `default_memory_bytes` (the memory usage with default dtypes).
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: The combined DataFrame.
+
+    Raises:
+        ValueError: If `frames` is empty.
+    """
+    frames = list(frames)
+    if not frames:
+        raise ValueError("No frames to concatenate.")
+    cat_cols = [
+        col for col in frames[0].columns
+        if all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames if col in f.columns)
+    ]
+    for col in cat_cols:
+        categories = union_categoricals(
+            [f[col] for f in frames if col in f.columns], ignore_order=True
+        ).categories
+        frames = [
+            f.assign(**{col: f[col].cat.set_categories(categories)}) if col in f.columns else f
+            for f in frames
+        ]
+
+    df = pd.concat(frames, ignore_index=True)
+
+    if metrics is not None:
+        metrics(
+            {
+                "matches": len(frames),
+                "rows": len(df),
+                "memory_bytes": int(df.memory_usage(deep=True).sum()),
+                "default_memory_bytes": _expanded_memory_usage(df),
+            }
+        )
+
+    return df
+
+
+def _read_names(json_data: dict[str, Any]) -> tuple[dict[int, str], dict[int, str]]:
+    """
+    Reads the player and team names of a match.
+
+    Args:
+        json_data (dict[str, Any]): The raw `matchCentreData` payload.
+
+    Returns:
+        tuple[dict[int, str], dict[int, str]]: Player names and team names by ID.
+    """
+    player_names = {int(k): v for k, v in json_data["playerIdNameDictionary"].items()}
+    team_names = {
+        int(json_data[side]["teamId"]): json_data[side]["name"]
+        for side in ["home", "away"]
+    }
+    return player_names, team_names
+
+
+def _map_names(
+        df: pd.DataFrame,
+        player_names: dict[int, str],
+        team_names: dict[int, str]
+) -> pd.DataFrame:
+    """
+    Fills the `player` and `team` columns from the player and team IDs.
+
+    Args:
+        df (pd.DataFrame): A DataFrame with `player_id` and `team_id` columns.
+        player_names (dict[int, str]): Player names by ID.
+        team_names (dict[int, str]): Team names by ID.
+
+    Returns:
+        pd.DataFrame: The DataFrame with `player` and `team` columns.
+    """
+    return df.assign(
+        player=lambda x: x.player_id.map(player_names).where(x.player_id.isin(player_names.keys()), x.player_id),
+        team=lambda x: x.team_id.map(team_names).where(x.team_id.isin(team_names.keys()), x.team_id)  # .replace(TEAMNAME_REPLACEMENTS),
+    )
+
+
+def _read_qualifiers(game_events: list[dict[str, Any]], match_id: int) -> pd.DataFrame:
+    """
+    Builds a long-format qualifier table from WhoScored events.
+
+    Each row of the table is one qualifier of one event. Qualifiers without a
+    value (flags such as "Head" or "LeftFoot") have a missing `value`.
+
+    Args:
+        game_events (list[dict[str, Any]]): The `events` list of a `matchCentreData` payload.
+        match_id (int): The numeric ID of the match on WhoScored.com.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the columns `game_id`, `id` (the WhoScored event
+            `id`, same as the `id` column of the "events" output), `qualifier_id` and `value`.
+    """
+    ids = []
+    qualifier_ids = []
+    values = []
+    for attr in game_events:
+        event_id = int(attr["id"] if "id" in attr else attr["eventId"])
+        for q in attr.get("qualifiers", []):
+            ids.append(event_id)
+            qualifier_ids.append(int(q["type"]["value"]))
+            values.append(q.get("value"))
+
+    return pd.DataFrame(
+        {
+            "game_id": pd.Series(match_id, index=range(len(ids)), dtype="int32"),
+            "id": pd.Series(ids, dtype="int64"),
+            "qualifier_id": pd.Series(qualifier_ids, dtype="int16"),
+            "value": pd.Categorical(values),
+        }
+    )
 
 
 def whoscored_read_event(
         match_id: int,
         output_fmt: str = "events",
         path_to_browser: str = "/usr/bin/google-chrome",
-        headless: bool = True
-) -> pd.DataFrame:
+        headless: bool = True,
+        qualifiers_fmt: str = "dict",
+        compact: bool = False,
+        retries: int = 0,
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> Union[pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]:
     """
     Retrieves and transforms soccer match event data from WhoScored.com.
 
@@ -33,54 +416,278 @@ def whoscored_read_event(
             Defaults to "/usr/bin/google-chrome".
         headless (bool, optional): Whether to run the browser in headless mode.
             Defaults to True.
+        qualifiers_fmt (str, optional): How event qualifiers are returned. Options are:
+            - "dict": as a `qualifiers` column of the events frame
+            - "long": as a separate long-format table with the columns `game_id`, `id`,
+              `qualifier_id` and `value`. The `id` is the WhoScored event `id`, so the
+              table joins to the "events" output on (`game_id`, `id`) and to the
+              `original_event_id` column of the "spadl" output.
+            Ignored if `output_fmt` is "raw". Defaults to "dict".
+        compact (bool, optional): Whether to downcast IDs, minutes, seconds and
+            coordinates to the smallest safe numeric types and low-cardinality strings
+            to categoricals. Use `whoscored_concat` to combine compact frames of
+            several matches. Ignored if `output_fmt` is "raw". Defaults to False.
+        retries (int, optional): How many times the page is reloaded if it has no
+            match centre data. Defaults to 0.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once with a metrics
+            record, also if the retrieval fails. The record has the keys `match_id`,
+            `output_fmt`, `timings` (seconds per phase: "driver_start", "page_load",
+            "execute_script", "json_decode", "build_events", "convert_to_actions",
+            "convert_to_atomic", "postprocess"), `payload_bytes`, `events`, `rows`,
+            `retries` and `error`. Defaults to None.
 
     Returns:
         pd.DataFrame: A DataFrame containing the match events in the specified format.
+            If `qualifiers_fmt` is "long", a tuple of this DataFrame and the qualifier
+            table is returned.
 
     Raises:
-        ImportError: If `output_fmt` is "spadl" or "atomic-spadl" but the `socceraction`
-            package is not installed.
-        ValueError: If `output_fmt` is not one of the expected values.
+        ImportError: If the `seleniumbase` package is not installed, or `output_fmt` is
+            "spadl"/"atomic-spadl" but the `socceraction` package is not installed.
+        RuntimeError: If the page has no match centre data after all `retries`.
+        ValueError: If `output_fmt` or `qualifiers_fmt` is not one of the expected values.
     """
+    if output_fmt not in ["raw", "events", "spadl", "atomic-spadl"]:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected 'raw', 'events', 'spadl' or 'atomic-spadl'."
+        )
+    if qualifiers_fmt not in ["dict", "long"]:
+        raise ValueError(
+            f"Invalid qualifiers_fmt: {qualifiers_fmt}. Expected 'dict' or 'long'."
+        )
 
-    driver = sb.Driver(
-        uc=True,
-        headless=headless,
-        binary_location=path_to_browser,
-    )
+    record = _new_record(match_id, output_fmt)
+    try:
+        return _read_event(
+            match_id, output_fmt, path_to_browser, headless, qualifiers_fmt, compact, retries, record
+        )
+    except Exception as e:
+        record["error"] = repr(e)
+        raise
+    finally:
+        if metrics is not None:
+            metrics(record)
+
+
+class _DriverHandle(object):
+    """
+    Shares the driver of a running retrieval with the thread that may cancel it.
+
+    A retrieval running in an executor thread cannot be interrupted from asyncio.
+    Quitting its driver instead makes the blocking Selenium call fail, which ends
+    the retrieval and its browser processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.driver = None
+        self.cancelled = False
+
+    def register(self, driver: Any) -> bool:
+        """
+        Registers the driver of the retrieval.
+
+        Args:
+            driver (Any): The started driver.
+
+        Returns:
+            bool: False if the retrieval was cancelled before the driver was started.
+                The caller must quit the driver then.
+        """
+        with self._lock:
+            self.driver = driver
+            return not self.cancelled
+
+    def cancel(self) -> None:
+        """Marks the retrieval as cancelled and quits its driver, if it was started."""
+        with self._lock:
+            self.cancelled = True
+            driver = self.driver
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def _read_event(
+        match_id: int,
+        output_fmt: str,
+        path_to_browser: str,
+        headless: bool,
+        qualifiers_fmt: str,
+        compact: bool,
+        retries: int,
+        record: dict[str, Any],
+        handle: Optional[_DriverHandle] = None
+) -> Union[dict[str, Any], pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Retrieves and transforms the event data of a match.
+
+    See `whoscored_read_event` for the arguments.
+
+    Args:
+        record (dict[str, Any]): Metrics record to add timings and counts to.
+        handle (_DriverHandle, optional): Handle to register the driver with, so that
+            the retrieval can be cancelled from another thread. Defaults to None.
+
+    Returns:
+        The match events in the specified format.
+
+    Raises:
+        RuntimeError: If the page has no match centre data after all retries, or the
+            retrieval was cancelled through `handle`.
+    """
+    with _timed(record, "driver_start"):
+        driver = _start_driver(path_to_browser, headless)
 
-    driver.get(f"https://www.whoscored.com/matches/{match_id}/live")
+    if handle is not None and not handle.register(driver):
+        driver.quit()
+        raise RuntimeError(f"Retrieval of match {match_id} was cancelled")
 
-    response = json.dumps(driver.execute_script("return " + "require.config.params['args'].matchCentreData")).encode(
-        "utf-8")
-    driver.close()
+    try:
+        with _timed(record, "page_load"):
+            driver.get(f"https://www.whoscored.com/matches/{match_id}/live")
 
-    reader = io.BytesIO(response)
-    reader.seek(0)
+        json_data = _read_match_centre(driver, record)
+        while json_data is None and record["retries"] < retries:
+            record["retries"] += 1
+            with _timed(record, "page_load"):
+                driver.refresh()
+            json_data = _read_match_centre(driver, record)
+    finally:
+        if handle is None or not handle.cancelled:
+            driver.quit()
 
-    json_data = json.load(reader)
+    if json_data is None:
+        raise RuntimeError(f"No matchCentreData for match {match_id} after {retries} retries")
 
     if output_fmt == "raw":
         return json_data
 
-    events = {}
-    player_names = {}
-    team_names = {}
+    return _convert_event(json_data, match_id, output_fmt, qualifiers_fmt, compact, record)
 
-    player_names.update(
-        {int(k): v for k, v in json_data["playerIdNameDictionary"].items()}
-    )
-    team_names.update(
-        {
-            int(json_data[side]["teamId"]): json_data[side]["name"]
-            for side in ["home", "away"]
-        }
-    )
+
+def _read_match_centre(driver: Any, record: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Extracts the `matchCentreData` JSON from a loaded WhoScored match page.
+
+    Args:
+        driver (Any): A Selenium driver with the match page loaded.
+        record (dict[str, Any]): Metrics record to add timings and payload size to.
+
+    Returns:
+        Optional[dict[str, Any]]: The `matchCentreData` payload, or None if the page
+            has no match centre data yet.
+    """
+    with _timed(record, "execute_script"):
+        match_centre = driver.execute_script("return " + "require.config.params['args'].matchCentreData")
+
+    with _timed(record, "json_decode"):
+        response = json.dumps(match_centre).encode("utf-8")
+
+        reader = io.BytesIO(response)
+        reader.seek(0)
+
+        json_data = json.load(reader)
+
+    record["payload_bytes"] = len(response)
+    if json_data is not None:
+        record["events"] = len(json_data["events"])
+
+    return json_data
+
+
+def whoscored_convert_event(
+        json_data: dict[str, Any],
+        match_id: int,
+        output_fmt: str = "events",
+        qualifiers_fmt: str = "dict",
+        compact: bool = False,
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> Union[pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Transforms a raw WhoScored `matchCentreData` payload into event data.
+
+    This is the conversion step of `whoscored_read_event`. It can be used on payloads
+    retrieved with `output_fmt="raw"` without opening a browser again.
+
+    Args:
+        json_data (dict[str, Any]): The raw `matchCentreData` payload.
+        match_id (int): The numeric ID of the match on WhoScored.com.
+        output_fmt (str, optional): The desired output format. One of "events", "spadl"
+            or "atomic-spadl". Defaults to "events".
+        qualifiers_fmt (str, optional): How event qualifiers are returned, see
+            `whoscored_read_event`. Defaults to "dict".
+        compact (bool, optional): Whether to return memory-compact dtypes, see
+            `whoscored_read_event`. Defaults to False.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once with a metrics
+            record of the conversion, see `whoscored_read_event`. Defaults to None.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the match events in the specified format.
+            If `qualifiers_fmt` is "long", a tuple of this DataFrame and the qualifier
+            table is returned.
+
+    Raises:
+        ImportError: If `output_fmt` is "spadl"/"atomic-spadl" but the `socceraction`
+            package is not installed.
+        ValueError: If `output_fmt` or `qualifiers_fmt` is not one of the expected values.
+    """
+    if output_fmt not in ["events", "spadl", "atomic-spadl"]:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected 'events', 'spadl' or 'atomic-spadl'."
+        )
+    if qualifiers_fmt not in ["dict", "long"]:
+        raise ValueError(
+            f"Invalid qualifiers_fmt: {qualifiers_fmt}. Expected 'dict' or 'long'."
+        )
+
+    record = _new_record(match_id, output_fmt)
+    try:
+        return _convert_event(json_data, match_id, output_fmt, qualifiers_fmt, compact, record)
+    except Exception as e:
+        record["error"] = repr(e)
+        raise
+    finally:
+        if metrics is not None:
+            metrics(record)
+
+
+def _convert_event(
+        json_data: dict[str, Any],
+        match_id: int,
+        output_fmt: str,
+        qualifiers_fmt: str,
+        compact: bool,
+        record: dict[str, Any],
+        map_names: bool = True
+) -> Union[pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Transforms a raw WhoScored `matchCentreData` payload into event data.
+
+    See `whoscored_convert_event` for the arguments.
+
+    Args:
+        record (dict[str, Any]): Metrics record to add timings and counts to.
+        map_names (bool, optional): Whether to fill the `player` and `team` columns.
+            If False, they are left empty, e.g. to fill them once for many matches.
+            Defaults to True.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the match events in the specified format,
+            or a tuple of this DataFrame and the qualifier table.
+    """
+    events = {}
     game_events = json_data["events"]
+    record["events"] = len(game_events)
     if output_fmt == "events":
-        df_events = pd.DataFrame(game_events)
-        df_events["game_id"] = match_id
-        events[match_id] = df_events
+        with _timed(record, "build_events"):
+            df_events = pd.DataFrame(game_events)
+            if qualifiers_fmt == "long":
+                df_events = df_events.drop(columns="qualifiers", errors="ignore")
+            df_events["game_id"] = match_id
+            events[match_id] = df_events
     elif output_fmt in ["spadl", "atomic-spadl"]:
         try:
             from socceraction.data.opta.parsers.base import assertget, _get_end_x, _get_end_y
@@ -99,98 +706,885 @@ def whoscored_read_event(
             period_id = int(assertget(period, "value"))
             return period_id
 
-        time_start_str = assertget(json_data, "startTime")
-        time_start = datetime.strptime(time_start_str, "%Y-%m-%dT%H:%M:%S")
-
-        events_action = {}
-        for attr in json_data["events"]:
-            event_id = int(assertget(attr, "id" if "id" in attr else "eventId"))
-            eventtype = attr.get("type", {})
-            start_x = float(assertget(attr, "x"))
-            start_y = float(assertget(attr, "y"))
-            minute = int(assertget(attr, "expandedMinute"))
-            second = int(attr.get("second", 0))
-            qualifiers = {
-                int(q["type"]["value"]): q.get("value", True) for q in attr.get("qualifiers", [])
-            }
-            end_x = attr.get("endX", _get_end_x(qualifiers))
-            end_y = attr.get("endY", _get_end_y(qualifiers))
-            events_action[(match_id, event_id)] = {
-                # Fields required by the base schema
-                "game_id": match_id,
-                "event_id": event_id,
-                "period_id": _get_period_id(attr),
-                "team_id": int(assertget(attr, "teamId")),
-                "player_id": int(attr.get("playerId")) if "playerId" in attr else None,
-                "type_id": int(assertget(eventtype, "value")),
-                # Fields required by the opta schema
-                # Timestamp is not availe in the data stream. The returned
-                # timestamp  is not accurate, but sufficient for camptability
-                # with the other Opta data streams.
-                "timestamp": (time_start + timedelta(seconds=(minute * 60 + second))),
-                "minute": minute,
-                "second": second,
-                "outcome": bool(attr["outcomeType"].get("value"))
-                if "outcomeType" in attr
-                else None,
-                "start_x": start_x,
-                "start_y": start_y,
-                "end_x": end_x if end_x is not None else start_x,
-                "end_y": end_y if end_y is not None else start_y,
-                "qualifiers": qualifiers,
-                # Optional fields
-                "related_player_id": int(attr.get("relatedPlayerId"))
-                if "relatedPlayerId" in attr
-                else None,
-                "touch": bool(attr.get("isTouch", False)),
-                "goal": bool(attr.get("isGoal", False)),
-                "shot": bool(attr.get("isShot", False)),
-            }
+        with _timed(record, "build_events"):
+            time_start_str = assertget(json_data, "startTime")
+            time_start = datetime.strptime(time_start_str, "%Y-%m-%dT%H:%M:%S")
 
-        df_events = (
-            pd.DataFrame.from_dict(events_action, orient="index")
-            .merge(_eventtypesdf, on="type_id", how="left")
-            .reset_index(drop=True)
-        )
+            events_action = {}
+            for attr in json_data["events"]:
+                event_id = int(assertget(attr, "id" if "id" in attr else "eventId"))
+                eventtype = attr.get("type", {})
+                start_x = float(assertget(attr, "x"))
+                start_y = float(assertget(attr, "y"))
+                minute = int(assertget(attr, "expandedMinute"))
+                second = int(attr.get("second", 0))
+                qualifiers = {
+                    int(q["type"]["value"]): q.get("value", True) for q in attr.get("qualifiers", [])
+                }
+                end_x = attr.get("endX", _get_end_x(qualifiers))
+                end_y = attr.get("endY", _get_end_y(qualifiers))
+                events_action[(match_id, event_id)] = {
+                    # Fields required by the base schema
+                    "game_id": match_id,
+                    "event_id": event_id,
+                    "period_id": _get_period_id(attr),
+                    "team_id": int(assertget(attr, "teamId")),
+                    "player_id": int(attr.get("playerId")) if "playerId" in attr else None,
+                    "type_id": int(assertget(eventtype, "value")),
+                    # Fields required by the opta schema
+                    # Timestamp is not availe in the data stream. The returned
+                    # timestamp  is not accurate, but sufficient for camptability
+                    # with the other Opta data streams.
+                    "timestamp": (time_start + timedelta(seconds=(minute * 60 + second))),
+                    "minute": minute,
+                    "second": second,
+                    "outcome": bool(attr["outcomeType"].get("value"))
+                    if "outcomeType" in attr
+                    else None,
+                    "start_x": start_x,
+                    "start_y": start_y,
+                    "end_x": end_x if end_x is not None else start_x,
+                    "end_y": end_y if end_y is not None else start_y,
+                    "qualifiers": qualifiers,
+                    # Optional fields
+                    "related_player_id": int(attr.get("relatedPlayerId"))
+                    if "relatedPlayerId" in attr
+                    else None,
+                    "touch": bool(attr.get("isTouch", False)),
+                    "goal": bool(attr.get("isGoal", False)),
+                    "shot": bool(attr.get("isShot", False)),
+                }
 
-        df_actions = convert_to_actions(
-            df_events, home_team_id=int(json_data["home"]["teamId"])
-        )
+            df_events = (
+                pd.DataFrame.from_dict(events_action, orient="index")
+                .merge(_eventtypesdf, on="type_id", how="left")
+                .reset_index(drop=True)
+            )
+
+        with _timed(record, "convert_to_actions"):
+            df_actions = convert_to_actions(
+                df_events, home_team_id=int(json_data["home"]["teamId"])
+            )
 
         if output_fmt == "spadl":
             events[match_id] = df_actions
         else:
-            events[match_id] = convert_to_atomic(df_actions)
+            with _timed(record, "convert_to_atomic"):
+                events[match_id] = convert_to_atomic(df_actions)
+
+    with _timed(record, "postprocess"):
+        df = pd.concat(events.values()).pipe(_standardize_colnames)
+        if map_names:
+            player_names, team_names = _read_names(json_data)
+            df = _map_names(df, player_names, team_names)
+
+        if output_fmt == "events":
+            cols = list(COLS_EVENTS.keys())
+            if qualifiers_fmt == "long":
+                cols[cols.index("qualifiers")] = "id"
+
+            for col in cols:
+                if col not in df.columns:
+                    df[col] = COLS_EVENTS.get(col)
+
+            df["outcome_type"] = df["outcome_type"].apply(
+                lambda x: x.get("displayName") if pd.notnull(x) else x
+            )
+            df["card_type"] = df["card_type"].apply(
+                lambda x: x.get("displayName") if pd.notnull(x) else x
+            )
+            df["type"] = df["type"].apply(lambda x: x.get("displayName") if pd.notnull(x) else x)
+            df["period"] = df["period"].apply(
+                lambda x: x.get("displayName") if pd.notnull(x) else x
+            )
+
+            df = df[cols]
+
+        if compact:
+            df = _compact_frame(df)
+
+        if qualifiers_fmt == "long":
+            df_qualifiers = _read_qualifiers(game_events, match_id)
+
+    record["rows"] = len(df)
+
+    if qualifiers_fmt == "long":
+        return df, df_qualifiers
+
+    return df
+
+
+def _convert_batch_item(
+        item: tuple[int, Union[dict[str, Any], str, Path]],
+        output_fmt: str,
+        qualifiers_fmt: str
+) -> tuple[pd.DataFrame, Optional[pd.DataFrame], dict[int, str], dict[int, str], dict[str, Any]]:
+    """
+    Converts the payload of one match of a batch.
+
+    Runs in a worker process of `whoscored_convert_batch`. Payloads given as paths are
+    read in the worker, so that only the file name is sent to the process.
+
+    Args:
+        item (tuple[int, Union[dict[str, Any], str, Path]]): The match ID and the raw
+            `matchCentreData` payload or the path to a JSON file with it.
+        output_fmt (str): One of "events", "spadl" or "atomic-spadl".
+        qualifiers_fmt (str): One of "dict" or "long".
+
+    Returns:
+        tuple: The converted frame without player and team names, the qualifier table
+            (or None), player names, team names and the metrics record.
+    """
+    match_id, payload = item
+    record = _new_record(match_id, output_fmt)
+    if isinstance(payload, (str, Path)):
+        with _timed(record, "json_decode"):
+            with open(payload, "rb") as f:
+                response = f.read()
+            payload = json.loads(response)
+        record["payload_bytes"] = len(response)
+
+    result = _convert_event(payload, match_id, output_fmt, qualifiers_fmt, False, record, map_names=False)
+    df, df_qualifiers = result if qualifiers_fmt == "long" else (result, None)
+    player_names, team_names = _read_names(payload)
+    return df, df_qualifiers, player_names, team_names, record
+
+
+def whoscored_convert_batch(
+        payloads: Union[Mapping[int, Union[dict[str, Any], str, Path]], Iterable[Union[str, Path]]],
+        output_fmt: str = "events",
+        qualifiers_fmt: str = "dict",
+        compact: bool = False,
+        n_jobs: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> Union[pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Converts the raw payloads of many matches into one combined DataFrame.
+
+    The conversion of the matches runs in a process pool, so re-processing a season
+    scales with the number of cores. Player and team names of all matches are merged
+    and filled once, and the result is built with a single concatenation.
+
+    Args:
+        payloads: Either a mapping of match IDs to raw `matchCentreData` payloads (or
+            paths to JSON files with them), or paths to JSON files named
+            `{match_id}.json`, e.g. payloads saved with `output_fmt="raw"`.
+        output_fmt (str, optional): The desired output format. One of "events", "spadl"
+            or "atomic-spadl". Defaults to "events".
+        qualifiers_fmt (str, optional): How event qualifiers are returned, see
+            `whoscored_read_event`. Defaults to "dict".
+        compact (bool, optional): Whether to return memory-compact dtypes, see
+            `whoscored_read_event`. Defaults to False.
+        n_jobs (int, optional): Number of worker processes. 1 converts in the current
+            process. Defaults to the number of CPUs.
+        chunksize (int, optional): Number of matches sent to a worker at once.
+            Defaults to about four chunks per worker.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once per match with
+            a metrics record of its conversion, see `whoscored_read_event`.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the events of all matches in the specified
+            format. If `qualifiers_fmt` is "long", a tuple of this DataFrame and the
+            qualifier table of all matches is returned.
+
+    Raises:
+        ImportError: If `output_fmt` is "spadl"/"atomic-spadl" but the `socceraction`
+            package is not installed.
+        ValueError: If `output_fmt` or `qualifiers_fmt` is not one of the expected values,
+            or `payloads` is empty.
+    """
+    if output_fmt not in ["events", "spadl", "atomic-spadl"]:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected 'events', 'spadl' or 'atomic-spadl'."
+        )
+    if qualifiers_fmt not in ["dict", "long"]:
+        raise ValueError(
+            f"Invalid qualifiers_fmt: {qualifiers_fmt}. Expected 'dict' or 'long'."
+        )
+
+    if isinstance(payloads, Mapping):
+        items = list(payloads.items())
+    else:
+        items = [(int(Path(path).stem), path) for path in payloads]
+    if not items:
+        raise ValueError("No payloads to convert.")
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    worker = functools.partial(_convert_batch_item, output_fmt=output_fmt, qualifiers_fmt=qualifiers_fmt)
+    if n_jobs == 1:
+        results = list(map(worker, items))
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(items) // (n_jobs * 4))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(worker, items, chunksize=chunksize))
+
+    player_names = {}
+    team_names = {}
+    for _, _, match_player_names, match_team_names, record in results:
+        player_names.update(match_player_names)
+        team_names.update(match_team_names)
+        if metrics is not None:
+            metrics(record)
+
+    df = pd.concat([result[0] for result in results], ignore_index=True)
+    df = _map_names(df, player_names, team_names)
+    if compact:
+        df = _compact_frame(df)
+
+    if qualifiers_fmt == "long":
+        return df, whoscored_concat([result[1] for result in results])
+
+    return df
+
+
+async def whoscored_read_event_async(
+        match_ids: Iterable[int],
+        output_fmt: str = "events",
+        path_to_browser: str = "/usr/bin/google-chrome",
+        headless: bool = True,
+        qualifiers_fmt: str = "dict",
+        compact: bool = False,
+        retries: int = 0,
+        max_concurrency: int = 2,
+        min_interval: float = 1.0,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Retrieves and transforms the event data of several matches from asyncio code.
+
+    The blocking browser work runs in a thread pool, so it does not stall the event
+    loop. At most `max_concurrency` browsers run at the same time, and consecutive page
+    loads start at least `min_interval` seconds apart. Results are yielded in the order
+    the matches finish.
+
+    If a match exceeds `timeout`, or the iteration is cancelled or closed early, the
+    drivers of the running matches are quit, which ends their browser processes.
+
+    Args:
+        match_ids (Iterable[int]): The numeric IDs of the matches on WhoScored.com.
+        output_fmt (str, optional): The desired output format, see `whoscored_read_event`.
+            Defaults to "events".
+        path_to_browser (str, optional): Path to the Chrome binary to use with Selenium.
+            Defaults to "/usr/bin/google-chrome".
+        headless (bool, optional): Whether to run the browser in headless mode.
+            Defaults to True.
+        qualifiers_fmt (str, optional): How event qualifiers are returned, see
+            `whoscored_read_event`. Defaults to "dict".
+        compact (bool, optional): Whether to return memory-compact dtypes, see
+            `whoscored_read_event`. Defaults to False.
+        retries (int, optional): How many times the page is reloaded if it has no
+            match centre data. Defaults to 0.
+        max_concurrency (int, optional): Maximum number of browsers running at the same
+            time. Defaults to 2.
+        min_interval (float, optional): Minimum number of seconds between the starts of
+            two retrievals. Defaults to 1.0.
+        timeout (float, optional): Maximum number of seconds per match, including the
+            browser start. Defaults to None (no timeout).
+        return_exceptions (bool, optional): Whether to yield (match_id, exception) for
+            failed matches instead of raising. Defaults to False.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once per match with
+            a metrics record, see `whoscored_read_event`. Defaults to None.
+
+    Yields:
+        tuple[int, Any]: The match ID and the match events in the specified format.
+
+    Raises:
+        asyncio.TimeoutError: If a match exceeds `timeout` and `return_exceptions` is False.
+        RuntimeError: If the page has no match centre data after all `retries`.
+        ValueError: If `output_fmt` or `qualifiers_fmt` is not one of the expected values.
+    """
+    if output_fmt not in ["raw", "events", "spadl", "atomic-spadl"]:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected 'raw', 'events', 'spadl' or 'atomic-spadl'."
+        )
+    if qualifiers_fmt not in ["dict", "long"]:
+        raise ValueError(
+            f"Invalid qualifiers_fmt: {qualifiers_fmt}. Expected 'dict' or 'long'."
+        )
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    rate_lock = asyncio.Lock()
+    last_start = None
+
+    def release_slot(_: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # The event loop is already closed.
+            pass
+
+    async def read(match_id: int) -> tuple[int, Any]:
+        nonlocal last_start
+        await semaphore.acquire()
+        try:
+            async with rate_lock:
+                if last_start is not None:
+                    delay = last_start + min_interval - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                last_start = loop.time()
+
+            record = _new_record(match_id, output_fmt)
+            handle = _DriverHandle()
+            future = executor.submit(
+                _read_event, match_id, output_fmt, path_to_browser, headless,
+                qualifiers_fmt, compact, retries, record, handle
+            )
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed only when the executor thread has returned. A timed-out
+        # retrieval cannot be interrupted and keeps its thread until then, so the
+        # timeout of the next match does not include waiting for a free thread.
+        future.add_done_callback(release_slot)
+
+        try:
+            return match_id, await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BaseException as e:
+            handle.cancel()
+            record["error"] = repr(e)
+            if return_exceptions and isinstance(e, Exception):
+                return match_id, e
+            raise
+        finally:
+            if metrics is not None:
+                metrics(record)
+
+    tasks = [asyncio.ensure_future(read(match_id)) for match_id in match_ids]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _match_finished(json_data: dict[str, Any]) -> bool:
+    """
+    Checks whether a `matchCentreData` payload belongs to a finished match.
+
+    Args:
+        json_data (dict[str, Any]): The raw `matchCentreData` payload.
+
+    Returns:
+        bool: True if the match is over.
+    """
+    if json_data.get("elapsed") in FINISHED_ELAPSED:
+        return True
+    game_events = json_data.get("events") or []
+    return bool(game_events) and game_events[-1].get("period", {}).get("displayName") == "PostGame"
+
+
+class _LiveActions(object):
+    """
+    Converts the events of a live match to SPADL or atomic-SPADL actions poll by poll.
+
+    The conversion of an event looks ahead: ball recoveries, clearances and
+    interceptions are fixed with the next action, and dribbles are added between
+    consecutive actions. A ball recovery is fixed with the next action that is not a
+    ball recovery, so only other events with actions ("anchors") bound the effect of
+    a change. Every run of new or changed events is therefore converted together with
+    the two anchors before it and the three after it, and the actions from the second
+    to last anchor of the match on are held back until later events arrive or the
+    match is over. The sent actions are the same as in the conversion of the full
+    match.
+
+    Every action is keyed by `source_event_id`, the WhoScored `id` of its event, or,
+    for actions added by the conversion (dribbles), of the preceding event. Only keys
+    whose actions differ from the ones sent before are sent (again), with all their
+    actions and the `action_id` values they had.
+    """
+
+    def __init__(self, match_id: int, output_fmt: str):
+        self.match_id = match_id
+        self.output_fmt = output_fmt
+        # Sent actions (without `action_id`) and their action IDs by source event ID.
+        self.sent = {}
+        self.action_ids = {}
+        # IDs of the held-back events at the end of the match.
+        self.pending = set()
+        self.n_actions = 0
+
+    def _extend(self, event_ids: list[int], anchors: list[bool], start: int, step: int, n: int) -> int:
+        """
+        Returns the position `n` anchors with sent actions away from `start`.
+
+        Args:
+            event_ids (list[int]): IDs of the events of the match.
+            anchors (list[bool]): Whether each event is not a ball recovery.
+            start (int): Position to start from.
+            step (int): -1 to go back, 1 to go forward.
+            n (int): Number of anchors with sent actions to pass.
+
+        Returns:
+            int: The position, or the first/last position of the match.
+        """
+        i = start
+        while n > 0 and 0 <= i + step < len(event_ids):
+            i += step
+            if anchors[i] and event_ids[i] in self.sent:
+                n -= 1
+        return i
+
+    def update(
+            self,
+            json_data: dict[str, Any],
+            changed_ids: set[int],
+            finished: bool,
+            record: dict[str, Any]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Converts the new, changed and held-back events of a poll.
+
+        Args:
+            json_data (dict[str, Any]): The `matchCentreData` payload of the poll.
+            changed_ids (set[int]): IDs of the new or changed events.
+            finished (bool): Whether the match is over, so that nothing is held back.
+            record (dict[str, Any]): Metrics record to add timings to.
+
+        Returns:
+            Optional[pd.DataFrame]: The new or changed actions with a `source_event_id`
+                column (possibly empty), or None if nothing was converted.
+        """
+        if not changed_ids and not (finished and self.pending):
+            return None
+
+        game_events = json_data["events"]
+        event_ids = [int(attr["id"] if "id" in attr else attr["eventId"]) for attr in game_events]
+        anchors = [attr.get("type", {}).get("value") != BALL_RECOVERY_TYPE for attr in game_events]
+        windows = []
+        for i, event_id in enumerate(event_ids):
+            if event_id not in changed_ids and event_id not in self.pending:
+                continue
+            lo = self._extend(event_ids, anchors, i, -1, 2)
+            hi = self._extend(event_ids, anchors, i, 1, 3)
+            if windows and lo <= windows[-1][1] + 1:
+                windows[-1][1] = max(windows[-1][1], hi)
+            else:
+                windows.append([lo, hi])
+            if hi == len(event_ids) - 1:
+                break
+
+        self.pending = set()
+        frames = []
+        df = None
+        for lo, hi in windows:
+            df = _convert_event(
+                {**json_data, "events": game_events[lo:hi + 1]},
+                self.match_id,
+                self.output_fmt,
+                "dict",
+                False,
+                record,
+            )
+            source_ids = pd.to_numeric(df["original_event_id"]).ffill()
+            # Dribbles before the first action belong to an event before the window.
+            df = df[source_ids.notna()].assign(source_event_id=source_ids.dropna().astype("int64"))
+            keys = list(df["source_event_id"].unique())
+            to_end = hi == len(event_ids) - 1
+            if not (to_end and finished):
+                # The keys from the second to last anchor on lack the actions after
+                # them, or are the context after a run of corrected events.
+                positions = {event_ids[i]: i for i in range(lo, hi + 1)}
+                anchor_keys = [key for key in keys if anchors[positions[key]]]
+                first_held = keys.index(anchor_keys[-2]) if len(anchor_keys) >= 2 else 0
+                held = keys[first_held:]
+                keys = keys[:first_held]
+                if to_end:
+                    first = min((positions[key] for key in held), default=lo)
+                    self.pending = set(event_ids[first:])
+
+            keys = set(keys)
+            for key, rows in df.groupby("source_event_id", sort=False):
+                if key not in keys:
+                    continue
+                values = rows.drop(columns="action_id").astype(object)
+                values = values.where(values.notna(), None).values.tolist()
+                if self.sent.get(key) == values:
+                    continue
+                old_ids = self.action_ids.get(key, [])
+                n_new = max(0, len(rows) - len(old_ids))
+                action_ids = old_ids[:len(rows)] + list(range(self.n_actions, self.n_actions + n_new))
+                self.n_actions += n_new
+                self.sent[key] = values
+                self.action_ids[key] = action_ids
+                frames.append(rows.assign(action_id=action_ids))
+
+        if df is None:
+            return None
+        if not frames:
+            return df.iloc[:0]
+        return pd.concat(frames, ignore_index=True)
+
+
+def whoscored_live_event(
+        match_id: int,
+        output_fmt: str = "events",
+        interval: float = 30.0,
+        path_to_browser: str = "/usr/bin/google-chrome",
+        headless: bool = True,
+        qualifiers_fmt: str = "dict",
+        compact: bool = False,
+        driver: Optional[Any] = None,
+        metrics: Optional[Callable[[dict[str, Any]], None]] = None
+) -> Iterator[Union[dict[str, Any], pd.DataFrame, tuple[pd.DataFrame, pd.DataFrame]]]:
+    """
+    Follows a match in progress and yields only new or changed events.
+
+    The match page is opened once and `matchCentreData` is polled every `interval`
+    seconds. Events are compared with the previous poll by their `id`, and only new or
+    changed events are converted, so the cost of a poll is proportional to the number
+    of new events. The iterator stops when the match is over.
+
+    Changed events are yielded again: consumers should upsert the "events" output by
+    (`team_id`, `event_id`). The "spadl"/"atomic-spadl" output has an extra
+    `source_event_id` column, the WhoScored `id` of the event an action is derived
+    from, or, for dribbles, of the preceding event. A yielded frame holds all actions
+    of its `source_event_id` values, so consumers should replace the actions with these
+    values they have stored. Replaced actions keep their `action_id`. As the conversion
+    of an event depends on the next actions, the actions of the last two events with
+    actions are held back until later events arrive or the match is over.
+
+    Args:
+        match_id (int): The numeric ID of the match on WhoScored.com.
+        output_fmt (str, optional): The desired output format, see `whoscored_read_event`.
+            For "raw" a copy of the payload with only the new events is yielded.
+            Defaults to "events".
+        interval (float, optional): Seconds to wait between polls. Defaults to 30.0.
+        path_to_browser (str, optional): Path to the Chrome binary to use with Selenium.
+            Defaults to "/usr/bin/google-chrome".
+        headless (bool, optional): Whether to run the browser in headless mode.
+            Defaults to True.
+        qualifiers_fmt (str, optional): How event qualifiers are returned, see
+            `whoscored_read_event`. Defaults to "dict".
+        compact (bool, optional): Whether to return memory-compact dtypes, see
+            `whoscored_read_event`. Defaults to False.
+        driver (Any, optional): A Selenium-like driver with `get`, `refresh` and
+            `execute_script` methods. If given, it is used instead of starting a new
+            browser and is not closed, e.g. a fake driver replaying recorded snapshots.
+            Defaults to None.
+        metrics (Callable[[dict[str, Any]], None], optional): Called once per poll with a
+            metrics record, see `whoscored_read_event`. Its `events` is the number of new
+            or changed events and the "diff" phase is the comparison with the previous
+            poll. Defaults to None.
+
+    Yields:
+        The new or changed events of each poll in the specified format.
+
+    Raises:
+        ImportError: If the `seleniumbase` package is not installed, or `output_fmt` is
+            "spadl"/"atomic-spadl" but the `socceraction` package is not installed.
+        ValueError: If `output_fmt` or `qualifiers_fmt` is not one of the expected values.
+    """
+    if output_fmt not in ["raw", "events", "spadl", "atomic-spadl"]:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected 'raw', 'events', 'spadl' or 'atomic-spadl'."
+        )
+    if qualifiers_fmt not in ["dict", "long"]:
+        raise ValueError(
+            f"Invalid qualifiers_fmt: {qualifiers_fmt}. Expected 'dict' or 'long'."
+        )
+
+    own_driver = driver is None
+    if own_driver:
+        driver = _start_driver(path_to_browser, headless)
+
+    seen_events = {}
+    live_actions = _LiveActions(match_id, output_fmt)
+    try:
+        record = _new_record(match_id, output_fmt)
+        with _timed(record, "page_load"):
+            driver.get(f"https://www.whoscored.com/matches/{match_id}/live")
+        while True:
+            json_data = _read_match_centre(driver, record)
+            result = None
+            if json_data is not None:
+                with _timed(record, "diff"):
+                    new_events = []
+                    for attr in json_data["events"]:
+                        event_id = attr["id"] if "id" in attr else attr["eventId"]
+                        if seen_events.get(event_id) != attr:
+                            seen_events[event_id] = attr
+                            new_events.append(attr)
+
+                if output_fmt in ["spadl", "atomic-spadl"]:
+                    df = live_actions.update(
+                        json_data,
+                        {int(attr["id"] if "id" in attr else attr["eventId"]) for attr in new_events},
+                        _match_finished(json_data),
+                        record,
+                    )
+                    if df is not None and (new_events or len(df) > 0):
+                        if compact:
+                            df = _compact_frame(df)
+                        record["rows"] = len(df)
+                        if qualifiers_fmt == "long":
+                            result = (df, _read_qualifiers(new_events, match_id))
+                        else:
+                            result = df
+                elif not new_events:
+                    pass
+                elif output_fmt == "raw":
+                    result = {**json_data, "events": new_events}
+                elif output_fmt == "events":
+                    result = _convert_event(
+                        {**json_data, "events": new_events},
+                        match_id,
+                        output_fmt,
+                        qualifiers_fmt,
+                        compact,
+                        record,
+                    )
+                record["events"] = len(new_events)
+
+            if metrics is not None:
+                metrics(record)
+            if result is not None:
+                yield result
+            if json_data is not None and _match_finished(json_data):
+                return
+
+            time.sleep(interval)
+            record = _new_record(match_id, output_fmt)
+            with _timed(record, "page_load"):
+                driver.refresh()
+    finally:
+        if own_driver:
+            driver.quit()
+
+
+def _import_pyarrow() -> tuple[Any, Any, Any]:
+    """
+    Imports pyarrow, which is required to write and read Parquet datasets.
+
+    Returns:
+        tuple[Any, Any, Any]: The `pyarrow`, `pyarrow.parquet` and `pyarrow.dataset`
+            modules.
+
+    Raises:
+        ImportError: If the `pyarrow` package is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "The pyarrow package is required to write and read Parquet datasets. "
+            "Please install it with `pip install pyarrow`."
+        )
+    return pa, pq, ds
+
+
+def _partition_value(value: Any) -> str:
+    """
+    Formats a competition or season name as a partition directory value.
+
+    Args:
+        value (Any): Competition or season, e.g. "ENG-Premier League" or "2024/2025".
+
+    Returns:
+        str: The value with path separators replaced.
+    """
+    return str(value).replace("/", "-").replace("\\", "-")
+
+
+def _storage_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts a WhoScored DataFrame to the dtypes used in Parquet datasets.
+
+    Every match file of a dataset must have the same schema, independently of
+    missing values or compact dtypes in a particular match: IDs are stored as nullable
+    int64, other numbers as int64/float64, flags as nullable booleans,
+    low-cardinality strings as strings and nested columns (qualifiers, satisfied
+    event types) as JSON strings.
+
+    Args:
+        df (pd.DataFrame): A DataFrame in "events", "spadl", "atomic-spadl" or
+            "qualifiers" format.
+
+    Returns:
+        pd.DataFrame: The DataFrame with storage dtypes.
+    """
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if col in CATEGORY_COLS or col == "value":
+            df[col] = s.astype(object).astype("string")
+        elif col in NESTED_COLS:
+            df[col] = s.map(lambda x: json.dumps(x) if isinstance(x, (list, dict)) else None).astype("string")
+        elif col in BOOL_COLS:
+            df[col] = s.astype(object).astype("boolean")
+        elif col == "id" or col.endswith("_id"):
+            df[col] = pd.to_numeric(s.astype(object)).astype("Int64")
+        elif pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+            continue
+        elif pd.api.types.is_integer_dtype(s):
+            df[col] = s.astype("int64")
+        else:
+            df[col] = s.astype("float64")
+    return df
+
 
-    df = (
-        pd.concat(events.values())
-        .pipe(standardize_colnames)
-        .assign(
-            player=lambda x: x.player_id.replace(player_names),
-            team=lambda x: x.team_id.replace(team_names)  # .replace(TEAMNAME_REPLACEMENTS),
+def whoscored_write_dataset(
+        df: pd.DataFrame,
+        path: Union[str, Path],
+        competition: str,
+        season: Union[str, int],
+        output_fmt: str = "events"
+) -> list[Path]:
+    """
+    Writes WhoScored data to a Parquet dataset partitioned by competition, season and format.
+
+    Each match is stored in its own file
+    `{path}/competition={competition}/season={season}/format={output_fmt}/{game_id}.parquet`.
+    Writing a match that is already in the dataset replaces its file, so appending
+    the same match twice is idempotent.
+
+    Args:
+        df (pd.DataFrame): Output of `whoscored_read_event` (or `whoscored_concat`) for
+            one or several matches, with a `game_id` column.
+        path (Union[str, Path]): Root directory of the dataset.
+        competition (str): Competition name, e.g. "ENG-Premier League".
+        season (Union[str, int]): Season, e.g. "2425" or "2024/2025".
+        output_fmt (str, optional): Format of `df`. One of "events", "spadl",
+            "atomic-spadl" or "qualifiers" (the long qualifier table). Defaults to "events".
+
+    Returns:
+        list[Path]: The written files.
+
+    Raises:
+        ImportError: If the `pyarrow` package is not installed.
+        ValueError: If `output_fmt` is not one of the expected values.
+    """
+    if output_fmt not in DATASET_FORMATS:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected one of {DATASET_FORMATS}."
         )
+    pa, pq, _ = _import_pyarrow()
+
+    partition_dir = (
+        Path(path)
+        / f"competition={_partition_value(competition)}"
+        / f"season={_partition_value(season)}"
+        / f"format={output_fmt}"
     )
+    partition_dir.mkdir(parents=True, exist_ok=True)
 
-    if output_fmt == "events":
+    files = []
+    for match_id, df_match in _storage_frame(df).groupby("game_id", sort=False):
+        file = partition_dir / f"{match_id}.parquet"
+        tmp_file = partition_dir / f".{match_id}.parquet.tmp"
+        table = pa.Table.from_pandas(df_match.reset_index(drop=True), preserve_index=False)
+        pq.write_table(table, tmp_file)
+        os.replace(tmp_file, file)
+        files.append(file)
+    return files
+
+
+def whoscored_read_dataset(
+        path: Union[str, Path],
+        output_fmt: str = "events",
+        competition: Optional[str] = None,
+        season: Optional[Union[str, int]] = None,
+        columns: Optional[list[str]] = None,
+        match_ids: Optional[list[int]] = None,
+        teams: Optional[list[Union[int, str]]] = None,
+        compact: bool = False
+) -> pd.DataFrame:
+    """
+    Reads WhoScored data from a Parquet dataset written by `whoscored_write_dataset`.
+
+    Only the requested columns are read, and files of other competitions, seasons,
+    formats and matches are skipped.
 
-        from soccerdata.whoscored import COLS_EVENTS
+    Args:
+        path (Union[str, Path]): Root directory of the dataset.
+        output_fmt (str, optional): Format to read. One of "events", "spadl",
+            "atomic-spadl" or "qualifiers". Defaults to "events".
+        competition (str, optional): Read only this competition. Defaults to None.
+        season (Union[str, int], optional): Read only this season. Defaults to None.
+        columns (list[str], optional): Columns to read. Defaults to all columns.
+        match_ids (list[int], optional): Read only these matches. Defaults to None.
+        teams (list[Union[int, str]], optional): Read only rows of these teams, given
+            as team IDs or team names. Defaults to None.
+        compact (bool, optional): Whether to return memory-compact dtypes, see
+            `whoscored_read_event`. Defaults to False.
 
-        for col, default in COLS_EVENTS.items():
-            if col not in df.columns:
-                df[col] = default
+    Returns:
+        pd.DataFrame: The matching rows of the dataset.
 
-        df["outcome_type"] = df["outcome_type"].apply(
-            lambda x: x.get("displayName") if pd.notnull(x) else x
+    Raises:
+        ImportError: If the `pyarrow` package is not installed.
+        ValueError: If `output_fmt` is not one of the expected values, or `teams` is
+            given for the "qualifiers" format, which has no team columns.
+    """
+    if output_fmt not in DATASET_FORMATS:
+        raise ValueError(
+            f"Invalid output_fmt: {output_fmt}. Expected one of {DATASET_FORMATS}."
         )
-        df["card_type"] = df["card_type"].apply(
-            lambda x: x.get("displayName") if pd.notnull(x) else x
+    if teams is not None and output_fmt == "qualifiers":
+        raise ValueError(
+            "The 'qualifiers' format has no team columns and cannot be filtered by teams. "
+            "Filter by match_ids instead."
         )
-        df["type"] = df["type"].apply(lambda x: x.get("displayName") if pd.notnull(x) else x)
-        df["period"] = df["period"].apply(
-            lambda x: x.get("displayName") if pd.notnull(x) else x
+    pa, _, ds = _import_pyarrow()
+
+    competition_dir = "*" if competition is None else _partition_value(competition)
+    season_dir = "*" if season is None else _partition_value(season)
+    pattern = f"competition={competition_dir}/season={season_dir}/format={output_fmt}"
+    if match_ids is None:
+        files = sorted(Path(path).glob(f"{pattern}/*.parquet"))
+    else:
+        files = sorted(
+            file for match_id in match_ids for file in Path(path).glob(f"{pattern}/{match_id}.parquet")
         )
+    if not files:
+        return pd.DataFrame(columns=columns)
+
+    partitioning = ds.partitioning(
+        pa.schema(
+            [("competition", pa.string()), ("season", pa.string()), ("format", pa.string())]
+        ),
+        flavor="hive",
+    )
+    dataset = ds.dataset(
+        [str(file) for file in files],
+        format="parquet",
+        partitioning=partitioning,
+        partition_base_dir=str(path),
+    )
+
+    expr = None
+    if teams is not None:
+        team_ids = [int(x) for x in teams if not isinstance(x, str)]
+        team_names = [x for x in teams if isinstance(x, str)]
+        expr = ds.field("team_id").isin(team_ids)
+        if team_names:
+            expr |= ds.field("team").isin(team_names)
+
+    if columns is None:
+        columns = [
+            col for col in dataset.schema.names if col not in ["competition", "season", "format"]
+        ]
+
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+    for col in NESTED_COLS:
+        if col in df.columns:
+            df[col] = df[col].map(lambda x: json.loads(x) if isinstance(x, str) else x)
 
-        df = df[list(COLS_EVENTS.keys())]
+    if compact:
+        df = _compact_frame(df)
 
     return df
 